@@ -0,0 +1,79 @@
+##########################################################################################
+# PLANIFICATEUR DE PLONGÉE - COMPARAISON DES MOTEURS
+# Auteur: Jérôme Lehuen
+# Version: 0.4 (15/09/2025)
+##########################################################################################
+
+# Mesure, dans un processus neuf pour chaque moteur, le temps d'import, le temps de
+# chargement des tables, le temps de recherche et la mémoire résidente maximale.
+# Usage : python bench_engines.py
+
+import subprocess
+import sys
+
+# Chemin pandas : ce que fait planner.py (Streamlit est importé s'il est installé)
+PANDAS_ENGINE = """
+import time
+t0 = time.perf_counter()
+try:
+    import streamlit
+except ImportError:
+    pass
+import pandas as pd
+import numpy as np
+t1 = time.perf_counter()
+mn90_tables = pd.read_csv('data/mn90_1.csv')
+azote_table = pd.read_csv('data/mn90_2.csv', index_col='GPS')
+majo_table = pd.read_csv('data/mn90_3.csv')
+t2 = time.perf_counter()
+for depth in range(10, 41):
+    for duration in range(20, 61):
+        mask = (
+            (depth > mn90_tables['P1']) &
+            (depth <= mn90_tables['P2']) &
+            (duration > mn90_tables['D1']) &
+            (duration <= mn90_tables['D2'])
+        )
+        row = mn90_tables[mask].iloc[0]
+t3 = time.perf_counter()
+"""
+
+LITE_ENGINE = """
+import time
+t0 = time.perf_counter()
+import mn90_lite
+t1 = time.perf_counter()
+tables = mn90_lite.load_tables()
+t2 = time.perf_counter()
+for depth in range(10, 41):
+    for duration in range(20, 61):
+        stops = mn90_lite.lookup_decompression(depth, duration, tables)
+t3 = time.perf_counter()
+"""
+
+REPORT = """
+import resource, sys
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+rss_mb = rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+print(f'{(t1 - t0) * 1000:.1f} {(t2 - t1) * 1000:.1f} {(t3 - t2) * 1000:.1f} {rss_mb:.1f}')
+"""
+
+def run_engine(code):
+    """Exécute un moteur dans un interpréteur neuf et retourne ses mesures"""
+    result = subprocess.run(
+        [sys.executable, '-c', code + REPORT], capture_output=True, text=True, check=True
+    )
+    return [float(x) for x in result.stdout.split()]
+
+def main():
+    print(f"{'Moteur':<8} {'Import (ms)':>12} {'Tables (ms)':>12} {'Recherche (ms)':>15} {'RSS max (Mo)':>13}")
+    for name, code in (('pandas', PANDAS_ENGINE), ('léger', LITE_ENGINE)):
+        try:
+            mesures = run_engine(code)
+        except subprocess.CalledProcessError as e:
+            print(f"{name:<8} indisponible ({e.stderr.strip().splitlines()[-1]})")
+            continue
+        print(f"{name:<8} {mesures[0]:>12.1f} {mesures[1]:>12.1f} {mesures[2]:>15.1f} {mesures[3]:>13.1f}")
+
+if __name__ == '__main__':
+    main()
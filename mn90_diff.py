@@ -0,0 +1,362 @@
+##########################################################################################
+# PLANIFICATEUR DE PLONGÉE - COMPARAISON DE DEUX JEUX DE TABLES MN90
+# Auteur: Jérôme Lehuen
+# Version: 0.4 (15/09/2025)
+##########################################################################################
+
+# Évalue tout le domaine discret des entrées avec deux jeux de tables (ancien et nouveau)
+# et liste chaque case dont les paliers, le GPS, la majoration ou la faisabilité change.
+# La faisabilité est calculée pour un seul jeu de paramètres d'air (options --sac, --bloc,
+# --gonflage, --reserve et --vitesse, par défaut ceux du planificateur) rappelé dans le résumé.
+# Les calculs sont vectorisés (numpy) et découpés par tranches de profondeur entre cœurs.
+# Usage : python mn90_diff.py data/ nouvelles_tables/ [--csv differences.csv]
+
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import csv
+import os
+import sys
+import time
+
+import numpy as np
+
+import mn90_lite
+
+# Classes de faisabilité (messages finaux de planner.py)
+HORS_TABLE = 0
+REALISABLE = 1
+RESERVE_INSUFFISANTE = 2
+IMPOSSIBLE = 3
+CLASSES = {
+    HORS_TABLE: 'hors table',
+    REALISABLE: 'réalisable',
+    RESERVE_INSUFFISANTE: 'réserve insuffisante',
+    IMPOSSIBLE: 'impossible',
+}
+
+##########################################################################################
+# Préparation des tables
+##########################################################################################
+
+def table_arrays(tables):
+    """Convertit les tables chargées par mn90_lite en tableaux numpy"""
+    n = len(tables.p1)
+    gps_list = list(tables.azote)
+    return {
+        'p1': np.asarray(tables.p1, dtype=np.int64),
+        'p2': np.asarray(tables.p2, dtype=np.int64),
+        'd1': np.asarray(tables.d1, dtype=np.int64),
+        'd2': np.asarray(tables.d2, dtype=np.int64),
+        'stops': np.asarray(tables.stops, dtype=np.int64).reshape(n, len(mn90_lite.STOP_DEPTHS)),
+        'gps': np.asarray(tables.gps + [''], dtype=object),  # dernière case : hors table
+        'intervalles': np.asarray(tables.intervalles, dtype=np.int64),
+        'azote_gps': {gps: i for i, gps in enumerate(gps_list)},
+        'azote': np.array(
+            [tables.azote[gps] for gps in gps_list], dtype=np.float64
+        ).reshape(len(gps_list), len(tables.intervalles)),
+        'majo': np.asarray(tables.majo, dtype=np.float64),
+        'majo_trie': tables.majo_trie,
+        'majo_profondeurs': np.asarray(tables.majo_profondeurs, dtype=np.int64),
+        'majo_valeurs': np.array(
+            tables.majo_valeurs, dtype=np.float64
+        ).reshape(len(tables.majo), len(tables.majo_profondeurs)),
+    }
+
+##########################################################################################
+# Calculs vectorisés
+##########################################################################################
+
+def _round1(values):
+    """Arrondi à 0.1 identique au round() Python utilisé par le planificateur"""
+    return np.array([round(v, 1) for v in values.ravel().tolist()]).reshape(values.shape)
+
+def _stops_at(arr, idx):
+    """Durées de palier des lignes indexées (0 pour les cases hors table)"""
+    if not len(arr['stops']):
+        return np.zeros(idx.shape + (len(mn90_lite.STOP_DEPTHS),), dtype=np.int64)
+    return np.where((idx >= 0)[..., None], arr['stops'][np.maximum(idx, 0)], 0)
+
+def evaluate_stops(arr, depths, durations):
+    """Indice de la ligne de paliers pour chaque profondeur × durée (-1 si hors table)"""
+    idx = np.full((len(depths), len(durations)), -1, dtype=np.int64)
+    d_start = np.searchsorted(depths, arr['p1'], 'right')
+    d_end = np.searchsorted(depths, arr['p2'], 'right')
+    t_start = np.searchsorted(durations, arr['d1'], 'right')
+    t_end = np.searchsorted(durations, arr['d2'], 'right')
+
+    # Parcours inverse : la première ligne correspondante du fichier l'emporte
+    for i in range(len(arr['p1']) - 1, -1, -1):
+        idx[d_start[i]:d_end[i], t_start[i]:t_end[i]] = i
+    return idx
+
+def evaluate_feasibility(arr, idx, depths, durations, params):
+    """Classe de faisabilité finale pour chaque profondeur × durée effective"""
+    stops = _stops_at(arr, idx)
+    sac = params['sac']
+
+    volume_paliers = np.zeros(idx.shape)
+    for k, stop_depth in enumerate(mn90_lite.STOP_DEPTHS):
+        volume_paliers = volume_paliers + (sac * ((stop_depth / 10) + 1)) * stops[..., k]
+
+    depth = depths[:, None]
+    duration = durations[None, :]
+    conso_max = sac * ((depth / 10) + 1)
+    conso_mi_prof = sac * (depth / 20 + 1)
+    volume_plongee = duration * conso_max
+    volume_remontee = (depth / params['vitesse']) * conso_mi_prof
+    volume_total = _round1(volume_paliers + volume_plongee + volume_remontee)
+
+    air_dispo_total = params['bloc'] * params['gonflage']
+    bars_restants_real = _round1((air_dispo_total - volume_total) / params['bloc'])
+
+    classes = np.where(
+        bars_restants_real >= params['reserve'], REALISABLE,
+        np.where(bars_restants_real > 0, RESERVE_INSUFFISANTE, IMPOSSIBLE)
+    )
+    return np.where(idx >= 0, classes, HORS_TABLE)
+
+def evaluate_majoration(arr, gps_list, intervals, depths):
+    """Majoration (et indicateur d'erreur) pour chaque GPS × intervalle × profondeur"""
+    shape = (len(gps_list), len(intervals), len(depths))
+
+    # Table vide ou sans colonnes : toutes les recherches échouent, comme dans mn90_lite
+    if not arr['azote'].size or not arr['majo_valeurs'].size:
+        return np.zeros(shape, dtype=np.int64), np.ones(shape, dtype=bool)
+
+    # Azote résiduelle : intervalle exact, sinon immédiatement inférieur
+    intervalles = arr['intervalles']
+    n = len(intervalles)
+    k = np.searchsorted(intervalles, intervals, 'left')
+    exact = (k < n) & (intervalles[np.minimum(k, n - 1)] == intervals)
+    lower = np.maximum(k - 1, 0)
+
+    rows = np.array([arr['azote_gps'].get(gps, -1) for gps in gps_list], dtype=np.int64)
+    table = arr['azote'][np.maximum(rows, 0)]
+    azote = np.where(exact[None, :], table[:, np.minimum(k, n - 1)], table[:, lower])
+    azote_error = (rows < 0)[:, None] | (~exact & ((k == 0) | (table[:, lower] == 0)))
+
+    # Ligne : valeur MAJO égale ou juste supérieure ; colonne : profondeur égale ou juste supérieure
+    majo = arr['majo']
+    if arr['majo_trie']:
+        ligne = np.searchsorted(majo, azote, 'left')
+    else:
+        above = majo[None, None, :] >= azote[..., None]
+        ligne = np.where(above.any(axis=-1), above.argmax(axis=-1), len(majo))
+    colonne = np.searchsorted(arr['majo_profondeurs'], depths, 'left')
+    ligne_error = ligne >= len(majo)
+    colonne_error = colonne >= len(arr['majo_profondeurs'])
+
+    values = arr['majo_valeurs'][
+        np.minimum(ligne, len(majo) - 1)[..., None],
+        np.minimum(colonne, len(arr['majo_profondeurs']) - 1)[None, None, :]
+    ].astype(np.int64)
+    error = (azote_error | ligne_error)[..., None] | colonne_error[None, None, :]
+    return np.where(error, 0, values), error
+
+def evaluate(arr, depths, params):
+    """Évalue un jeu de tables sur les profondeurs données (tout le reste du domaine)"""
+    durations = params['durations']
+    idx = evaluate_stops(arr, depths, durations)
+    feasibility = evaluate_feasibility(arr, idx, depths, durations, params)
+    majoration, majo_error = evaluate_majoration(arr, params['gps'], params['intervals'], depths)
+
+    # Plongée successive : le planificateur poursuit avec une majoration nulle en cas d'erreur
+    dives = params['dive_durations']
+    effective = dives[None, None, None, :] + majoration[..., None]
+    column = np.searchsorted(durations, effective, 'left')
+    inside = (column < len(durations)) & (durations[np.minimum(column, len(durations) - 1)] == effective)
+    rows = np.arange(len(depths))[None, None, :, None]
+    successive = np.where(inside, feasibility[rows, np.minimum(column, len(durations) - 1)], HORS_TABLE)
+
+    return {
+        'idx': idx,
+        'feasibility': feasibility,
+        'majoration': majoration,
+        'majo_error': majo_error,
+        'successive': successive,
+    }
+
+##########################################################################################
+# Comparaison
+##########################################################################################
+
+def _format_stops(arr, i):
+    if i < 0:
+        return 'hors table'
+    paliers = [f'{p}m:{t}' for p, t in zip(mn90_lite.STOP_DEPTHS, arr['stops'][i]) if t > 0]
+    return ' '.join(paliers) or 'aucun'
+
+def _format_majoration(value, error):
+    return 'erreur' if error else str(value)
+
+def compare_chunk(old, new, depths, params):
+    """Compare les deux jeux de tables sur une tranche de profondeurs"""
+    a = evaluate(old, depths, params)
+    b = evaluate(new, depths, params)
+    durations = params['durations']
+    dives = params['dive_durations']
+    differences = []
+
+    stops_a = _stops_at(old, a['idx'])
+    stops_b = _stops_at(new, b['idx'])
+    changed = (stops_a != stops_b).any(axis=-1) | ((a['idx'] < 0) != (b['idx'] < 0))
+    for d, t in zip(*np.nonzero(changed)):
+        differences.append(('paliers', depths[d], durations[t], '', '',
+                            _format_stops(old, a['idx'][d, t]), _format_stops(new, b['idx'][d, t])))
+
+    gps_a = old['gps'][a['idx']]
+    gps_b = new['gps'][b['idx']]
+    for d, t in zip(*np.nonzero(gps_a != gps_b)):
+        differences.append(('gps', depths[d], durations[t], '', '', gps_a[d, t] or 'hors table', gps_b[d, t] or 'hors table'))
+
+    changed = (a['majoration'] != b['majoration']) | (a['majo_error'] != b['majo_error'])
+    for g, i, d in zip(*np.nonzero(changed)):
+        differences.append(('majoration', depths[d], '', params['gps'][g], params['intervals'][i],
+                            _format_majoration(a['majoration'][g, i, d], a['majo_error'][g, i, d]),
+                            _format_majoration(b['majoration'][g, i, d], b['majo_error'][g, i, d])))
+
+    single = dives - 1  # les durées de plongée simple sont les premières colonnes
+    fa = a['feasibility'][:, single]
+    fb = b['feasibility'][:, single]
+    for d, t in zip(*np.nonzero(fa != fb)):
+        differences.append(('faisabilite', depths[d], dives[t], '', '', CLASSES[fa[d, t]], CLASSES[fb[d, t]]))
+
+    sa = a['successive']
+    sb = b['successive']
+    for g, i, d, t in zip(*np.nonzero(sa != sb)):
+        differences.append(('faisabilite', depths[d], dives[t], params['gps'][g], params['intervals'][i],
+                            CLASSES[sa[g, i, d, t]], CLASSES[sb[g, i, d, t]]))
+
+    return [tuple(x.item() if isinstance(x, np.generic) else x for x in row) for row in differences]
+
+def _compare_chunk(args):
+    return compare_chunk(*args)
+
+def compare_tables(old_tables, new_tables, params, jobs=1):
+    """Compare deux jeux de tables sur tout le domaine et retourne les cases modifiées"""
+    old = table_arrays(old_tables)
+    new = table_arrays(new_tables)
+    chunks = [c for c in np.array_split(params['depths'], max(1, jobs)) if len(c)]
+    tasks = [(old, new, chunk, params) for chunk in chunks]
+
+    if len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=len(tasks)) as executor:
+            results = list(executor.map(_compare_chunk, tasks))
+    else:
+        results = [_compare_chunk(task) for task in tasks]
+    return [row for result in results for row in result]
+
+def build_domain(old_tables, new_tables, args):
+    """Domaine discret des entrées couvert par les deux jeux de tables"""
+    depth_max = max(
+        max(old_tables.p2, default=0), max(new_tables.p2, default=0),
+        max(old_tables.majo_profondeurs, default=0), max(new_tables.majo_profondeurs, default=0),
+    )
+    duration_max = max(max(old_tables.d2, default=0), max(new_tables.d2, default=0), args.duree_max)
+    gps = sorted(set(old_tables.azote) | set(new_tables.azote))
+    return {
+        'depths': np.arange(1, depth_max + 1),
+        'durations': np.arange(1, duration_max + 1),
+        'dive_durations': np.arange(1, args.duree_max + 1),
+        'gps': gps,
+        'intervals': np.arange(args.intervalle_pas, args.intervalle_max + 1, args.intervalle_pas),
+        'vitesse': args.vitesse,
+        'sac': args.sac,
+        'bloc': args.bloc,
+        'gonflage': args.gonflage,
+        'reserve': args.reserve,
+    }
+
+def depth_bands(tables):
+    """Tranches de profondeur (P1, P2] de la table de paliers"""
+    return list(zip(tables.band_p1, tables.band_p2))
+
+def band_label(depth, bands):
+    for p1, p2 in bands:
+        if p1 < depth <= p2:
+            return f'{p1}-{p2}m'
+    return 'hors tranches'
+
+##########################################################################################
+# Interface en ligne de commande
+##########################################################################################
+
+def positive_int(value):
+    """Type argparse : entier strictement positif"""
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"valeur strictement positive attendue : {value}")
+    return number
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare deux jeux de tables MN90 sur tout le domaine des entrées")
+    parser.add_argument('ancien', help="Répertoire des tables de référence")
+    parser.add_argument('nouveau', help="Répertoire des tables à comparer")
+    parser.add_argument('--csv', help="Fichier CSV recevant toutes les cases modifiées")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help="Nombre de processus")
+    parser.add_argument('--duree-max', type=int, default=60, help="Durée max avant remontée (mn)")
+    parser.add_argument('--intervalle-max', type=int, default=720, help="Intervalle de surface max (mn)")
+    parser.add_argument('--intervalle-pas', type=positive_int, default=15, help="Pas de l'intervalle de surface (mn)")
+    parser.add_argument('--vitesse', type=positive_int, default=10, help="Vitesse de remontée (mètres/mn)")
+    parser.add_argument('--sac', type=positive_int, default=20, help="Consommation du plongeur (litres/mn)")
+    parser.add_argument('--bloc', type=positive_int, default=15, help="Capacité du bloc (litres)")
+    parser.add_argument('--gonflage', type=positive_int, default=200, help="Pression de gonflage (bars)")
+    parser.add_argument('--reserve', type=int, default=50, help="Réserve de sécurité (bars)")
+    args = parser.parse_args(argv)
+
+    try:
+        old_tables = mn90_lite.load_tables(args.ancien)
+        new_tables = mn90_lite.load_tables(args.nouveau)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Erreur lors du chargement : {e}", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    params = build_domain(old_tables, new_tables, args)
+    differences = compare_tables(old_tables, new_tables, params, args.jobs)
+    elapsed = time.perf_counter() - start
+
+    # Sans --csv, les cases vont sur la sortie standard et le résumé sur la sortie d'erreur
+    header = ('categorie', 'profondeur', 'duree', 'gps', 'intervalle', 'ancien', 'nouveau')
+    if args.csv:
+        with open(args.csv, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(differences)
+        out = sys.stdout
+    else:
+        writer = csv.writer(sys.stdout)
+        writer.writerow(header)
+        writer.writerows(differences)
+        out = sys.stderr
+
+    n_depths, n_durations = len(params['depths']), len(params['durations'])
+    n_successive = len(params['gps']) * len(params['intervals'])
+    print(f"\nDomaine évalué en {elapsed:.2f} s :", file=out)
+    print(f"- paliers/GPS : {n_depths * n_durations} cases (profondeur × durée)", file=out)
+    print(f"- majoration : {n_successive * n_depths} cases (GPS × intervalle × profondeur)", file=out)
+    print(f"- faisabilité : {(1 + n_successive) * n_depths * len(params['dive_durations'])} cases", file=out)
+    print(f"  (SAC {args.sac} litres/mn, bloc {args.bloc} litres, gonflage {args.gonflage} bars, "
+          f"réserve {args.reserve} bars, remontée {args.vitesse} mètres/mn)", file=out)
+
+    categories = ('paliers', 'gps', 'majoration', 'faisabilite')
+    bands = depth_bands(old_tables)
+    summary = {}
+    for row in differences:
+        counts = summary.setdefault(band_label(row[1], bands), dict.fromkeys(categories, 0))
+        counts[row[0]] += 1
+
+    if not summary:
+        print("\nAucune différence entre les deux jeux de tables", file=out)
+        return 0
+
+    print(f"\n{len(differences)} cases modifiées, par tranche de profondeur :", file=out)
+    print(f"{'Tranche':<14}" + ''.join(f'{c:>13}' for c in categories), file=out)
+    labels = [f'{p1}-{p2}m' for p1, p2 in bands] + ['hors tranches']
+    for label in labels:
+        if label in summary:
+            print(f"{label:<14}" + ''.join(f'{summary[label][c]:>13}' for c in categories), file=out)
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
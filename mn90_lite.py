@@ -0,0 +1,469 @@
+##########################################################################################
+# PLANIFICATEUR DE PLONGÉE - MOTEUR LÉGER
+# Auteur: Jérôme Lehuen
+# Version: 0.4 (15/09/2025)
+##########################################################################################
+
+# Ce moteur reproduit les calculs de planner.py sans pandas ni Streamlit (bibliothèque
+# standard uniquement) pour tourner sur des petites cartes embarquées. Les résultats
+# sont des enregistrements immuables (__slots__) au lieu de dictionnaires.
+
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Optional
+import argparse
+import csv
+import os
+
+data_dir = 'data'
+data_1 = 'mn90_1.csv' # Table de paliers
+data_2 = 'mn90_2.csv' # Table d'azote résiduelle
+data_3 = 'mn90_3.csv' # Table de majoration
+
+STOP_DEPTHS = (15, 12, 9, 6, 3)
+
+##########################################################################################
+# Enregistrements de résultats
+##########################################################################################
+
+@dataclass(frozen=True, slots=True)
+class Palier:
+    profondeur: int
+    duree: int
+
+@dataclass(frozen=True, slots=True)
+class DecompressionStops:
+    paliers: tuple
+    gps: str
+    error: bool
+
+@dataclass(frozen=True, slots=True)
+class AzoteResult:
+    azote: float
+    error: bool
+    message: str
+    intervalle_utilise: Optional[int] = None
+    methode: Optional[str] = None
+
+@dataclass(frozen=True, slots=True)
+class MajorationResult:
+    majoration: int
+    error: bool
+    message: str
+    majo_utilisee: Optional[float] = None
+    profondeur_utilisee: Optional[int] = None
+
+@dataclass(frozen=True, slots=True)
+class PalierDetail:
+    profondeur: int
+    duree: int
+    pression: float
+    conso_min: float
+    volume: float
+
+@dataclass(frozen=True, slots=True)
+class AirConsumption:
+    pressure_max: float
+    conso_max: float
+    conso_mi_prof: float
+    duree_paliers: int
+    volume_paliers: float
+    volume_plongee: float
+    duree_remontee: float
+    volume_remontee: float
+    volume_total: float
+    dtr: float
+    temps_total_plongee: float
+    palier_details: tuple
+
+@dataclass(frozen=True, slots=True)
+class AirRemaining:
+    air_dispo_total: float
+    air_reste_litres: float
+    bars_restants: float
+    bars_restants_real: float
+    pression_decollage: float
+    pression_decollage_real: float
+    suffisant: bool
+    marge_ou_deficit: float
+
+NO_STOPS = tuple(Palier(prof, 0) for prof in STOP_DEPTHS)
+DECOMPRESSION_ERROR = DecompressionStops(NO_STOPS, '', True)
+
+##########################################################################################
+# Chargement des tables
+##########################################################################################
+
+class MN90Tables:
+    """Tables MN90 stockées dans des tableaux compacts, avec index de recherche"""
+
+    __slots__ = (
+        'p1', 'p2', 'd1', 'd2', 'stops', 'gps',
+        'band_p1', 'band_p2', 'band_start', 'indexed',
+        'intervalles', 'azote',
+        'majo', 'majo_trie', 'majo_profondeurs', 'majo_valeurs',
+    )
+
+    def __init__(self, paliers_rows, azote_rows, majo_rows):
+        # Table de paliers : une colonne par tableau
+        self.p1 = array('i')
+        self.p2 = array('i')
+        self.d1 = array('i')
+        self.d2 = array('i')
+        self.stops = array('i')  # 5 durées de palier par ligne (15m, 12m, 9m, 6m, 3m)
+        self.gps = []
+        for row in paliers_rows:
+            self.p1.append(int(row['P1']))
+            self.p2.append(int(row['P2']))
+            self.d1.append(int(row['D1']))
+            self.d2.append(int(row['D2']))
+            self.stops.extend(_to_int(row.get(f'{prof}m')) for prof in STOP_DEPTHS)
+            self.gps.append(row.get('GPS') or '')
+        self._build_index()
+
+        # Table d'azote résiduelle : intervalles triés, une ligne de valeurs par GPS
+        self.intervalles = array('i')
+        self.azote = {}
+        if azote_rows:
+            colonnes = sorted((int(col), col) for col in azote_rows[0] if col.isdigit())
+            self.intervalles.extend(val for val, _ in colonnes)
+            for row in azote_rows:
+                self.azote[row['GPS']] = array('d', (float(row[col]) for _, col in colonnes))
+
+        # Table de majoration : lignes dans l'ordre du fichier, profondeurs triées
+        self.majo = array('d')
+        self.majo_profondeurs = array('i')
+        self.majo_valeurs = []
+        if majo_rows:
+            colonnes = sorted((int(col), col) for col in majo_rows[0] if col != 'MAJO' and col.isdigit())
+            self.majo_profondeurs.extend(val for val, _ in colonnes)
+            for row in majo_rows:
+                self.majo.append(float(row['MAJO']))
+                self.majo_valeurs.append(array('d', (float(row[col]) for _, col in colonnes)))
+        self.majo_trie = all(a < b for a, b in zip(self.majo, self.majo[1:]))
+
+    def _build_index(self):
+        """Regroupe les lignes par tranche de profondeur si la table est ordonnée et contiguë"""
+        self.band_p1 = array('i')
+        self.band_p2 = array('i')
+        self.band_start = array('i')
+        for i in range(len(self.p1)):
+            if not self.band_p2 or self.p2[i] != self.band_p2[-1] or self.p1[i] != self.band_p1[-1]:
+                self.band_p1.append(self.p1[i])
+                self.band_p2.append(self.p2[i])
+                self.band_start.append(i)
+        self.band_start.append(len(self.p1))
+
+        # Sans ordre strict (tranches et durées croissantes, sans recouvrement),
+        # la recherche dichotomique ne garantit plus la première correspondance
+        self.indexed = all(
+            self.band_p2[b] <= self.band_p1[b + 1] for b in range(len(self.band_p2) - 1)
+        ) and all(
+            self.d2[i] <= self.d1[i + 1]
+            for b in range(len(self.band_p2))
+            for i in range(self.band_start[b], self.band_start[b + 1] - 1)
+        )
+
+    @property
+    def empty(self):
+        return not self.p1
+
+def _to_int(value):
+    """Convertit une cellule CSV en entier (0 si vide)"""
+    return int(float(value)) if value not in (None, '') else 0
+
+def _read_csv(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        return list(csv.DictReader(f))
+
+def load_tables(directory=data_dir):
+    """Charge les trois tables MN90 depuis les fichiers CSV"""
+    rows = []
+    for name in (data_1, data_2, data_3):
+        path = os.path.join(directory, name)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Fichier {name} non trouvé")
+        rows.append(_read_csv(path))
+    return MN90Tables(*rows)
+
+##########################################################################################
+# Fonctions de calcul
+##########################################################################################
+
+def _find_row(depth, duration, tables):
+    """Retourne l'indice de la première ligne correspondante, ou None"""
+    if tables.indexed:
+        b = bisect_left(tables.band_p2, depth)
+        if b == len(tables.band_p2) or depth <= tables.band_p1[b]:
+            return None
+        start, end = tables.band_start[b], tables.band_start[b + 1]
+        i = bisect_left(tables.d2, duration, start, end)
+        if i == end or duration <= tables.d1[i]:
+            return None
+        return i
+
+    for i in range(len(tables.p1)):
+        if tables.p1[i] < depth <= tables.p2[i] and tables.d1[i] < duration <= tables.d2[i]:
+            return i
+    return None
+
+def lookup_decompression(depth, duration, tables):
+    """Recherche les paramètres de décompression dans les tables MN90"""
+    if tables.empty:
+        return DECOMPRESSION_ERROR
+
+    i = _find_row(depth, duration, tables)
+    if i is None:
+        return DECOMPRESSION_ERROR
+
+    offset = i * len(STOP_DEPTHS)
+    paliers = tuple(
+        Palier(prof, tables.stops[offset + k]) for k, prof in enumerate(STOP_DEPTHS)
+    )
+    return DecompressionStops(paliers, tables.gps[i], False)
+
+def lookup_azote_residuel(gps, intervalle_surface, tables):
+    """
+    Recherche l'azote résiduelle dans la table MN90
+    Utilise l'intervalle immédiatement inférieur si l'intervalle exact n'existe pas
+    """
+    if not tables.azote or not tables.intervalles:
+        return AzoteResult(0, True, 'Table azote non chargée')
+
+    valeurs = tables.azote.get(gps)
+    if valeurs is None:
+        return AzoteResult(0, True, f'GPS {gps} non trouvé dans la table')
+
+    intervalles = tables.intervalles
+    k = bisect_left(intervalles, intervalle_surface)
+
+    # Si l'intervalle exact existe, l'utiliser
+    if k < len(intervalles) and intervalles[k] == intervalle_surface:
+        azote_value = valeurs[k]
+        return AzoteResult(
+            azote_value if azote_value != 0 else 0, False,
+            f'Azote résiduelle pour GPS {gps} et intervalle {intervalle_surface}min',
+            intervalle_surface, 'exact'
+        )
+
+    # Intervalle immédiatement inférieur (logique MN90)
+    if k > 0:
+        intervalle_inferieur = intervalles[k - 1]
+        azote_value = valeurs[k - 1]
+        if azote_value == 0:
+            return AzoteResult(
+                0, True,
+                f'Intervalle de surface trop long ({intervalle_surface}min) - Au-delà des limites de la table MN90'
+            )
+        return AzoteResult(
+            azote_value, False,
+            f'Azote résiduelle pour GPS {gps} (intervalle {intervalle_inferieur}min utilisé pour {intervalle_surface}min)',
+            intervalle_inferieur, 'inférieur'
+        )
+
+    # Intervalle trop court (inférieur au minimum de la table)
+    return AzoteResult(
+        0, True,
+        f'Intervalle de surface trop court ({intervalle_surface}min) - Minimum dans la table: {intervalles[0]}min'
+    )
+
+def lookup_majoration_from_tables(azote_residuel, profondeur, tables):
+    """
+    Recherche la majoration dans la table majo.csv selon les règles MN90
+    """
+    if not tables.majo:
+        return MajorationResult(0, True, 'Table majoration non chargée')
+
+    # Ligne : valeur MAJO égale ou juste supérieure à l'azote résiduel
+    if tables.majo_trie:
+        ligne = bisect_left(tables.majo, azote_residuel)
+        if ligne == len(tables.majo):
+            ligne = None
+    else:
+        ligne = next((i for i, m in enumerate(tables.majo) if m >= azote_residuel), None)
+    if ligne is None:
+        return MajorationResult(
+            0, True,
+            f'Azote résiduelle trop élevée ({azote_residuel}) - Au-delà des limites de la table'
+        )
+    majo_utilisee = tables.majo[ligne]
+
+    # Colonne : profondeur égale ou juste supérieure
+    colonne = bisect_left(tables.majo_profondeurs, profondeur)
+    if colonne == len(tables.majo_profondeurs):
+        return MajorationResult(
+            0, True,
+            f'Profondeur trop importante ({profondeur}m) - Au-delà des limites de la table'
+        )
+    profondeur_utilisee = tables.majo_profondeurs[colonne]
+    majoration_value = int(tables.majo_valeurs[ligne][colonne])
+
+    return MajorationResult(
+        majoration_value, False,
+        f'Majoration trouvée : {majoration_value}min (MAJO:{majo_utilisee}, Prof:{profondeur_utilisee}m)',
+        majo_utilisee, profondeur_utilisee
+    )
+
+def calculate_air_consumption_excel_method(depth, duration, sac, ascent_speed, decompression_stops):
+    """Calcul de la consommation d'air"""
+    if depth <= 0 or duration <= 0 or sac <= 0 or ascent_speed <= 0:
+        return None
+
+    # Pressions et consommations de base
+    pressure_max = (depth / 10) + 1
+    conso_max = sac * pressure_max
+    conso_mi_prof = sac * (depth / 20 + 1)
+
+    # Volume consommé pendant les paliers
+    volume_paliers = 0
+    duree_paliers = 0
+    palier_details = []
+
+    for palier in decompression_stops.paliers:
+        if palier.duree > 0:
+            pressure_palier = (palier.profondeur / 10) + 1
+            conso_litres_min = sac * pressure_palier
+            volume = conso_litres_min * palier.duree
+            volume_paliers += volume
+            duree_paliers += palier.duree
+            palier_details.append(PalierDetail(
+                palier.profondeur, palier.duree, pressure_palier, conso_litres_min, volume
+            ))
+
+    # Volume pendant la plongée au fond
+    volume_plongee = duration * conso_max
+
+    # Volume pendant la remontée
+    duree_remontee = depth / ascent_speed
+    volume_remontee = duree_remontee * conso_mi_prof
+
+    # Calculs DTR et temps total
+    dtr = duree_remontee + duree_paliers
+    temps_total_plongee = duration + dtr
+
+    # Volume total consommé
+    volume_total = volume_paliers + volume_plongee + volume_remontee
+
+    return AirConsumption(
+        pressure_max=pressure_max,
+        conso_max=conso_max,
+        conso_mi_prof=conso_mi_prof,
+        duree_paliers=duree_paliers,
+        volume_paliers=round(volume_paliers, 1),
+        volume_plongee=round(volume_plongee, 1),
+        duree_remontee=round(duree_remontee, 2),
+        volume_remontee=round(volume_remontee, 1),
+        volume_total=round(volume_total, 1),
+        dtr=round(dtr, 1),
+        temps_total_plongee=round(temps_total_plongee, 1),
+        palier_details=tuple(palier_details),
+    )
+
+def calculate_air_remaining(tank_capacity, tank_pressure, reserve, volume_total_litres, volume_plongee_litres):
+    """Calcule l'air restant et la pression de décollage"""
+    if tank_capacity <= 0:
+        return None
+
+    air_dispo_total = tank_capacity * tank_pressure
+
+    # Pression de décollage (après consommation au fond, avant remontée)
+    air_apres_fond = air_dispo_total - volume_plongee_litres
+    pression_decollage = air_apres_fond / tank_capacity
+
+    # Calcul final après toute la plongée
+    air_reste_litres = air_dispo_total - volume_total_litres
+    bars_restants = air_reste_litres / tank_capacity
+
+    return AirRemaining(
+        air_dispo_total=air_dispo_total,
+        air_reste_litres=round(air_reste_litres, 1),
+        bars_restants=round(max(0, bars_restants), 1),
+        bars_restants_real=round(bars_restants, 1),
+        pression_decollage=round(max(0, pression_decollage), 1),
+        pression_decollage_real=round(pression_decollage, 1),
+        suffisant=bars_restants >= reserve,
+        marge_ou_deficit=round(bars_restants - reserve, 1),
+    )
+
+##########################################################################################
+# Interface en ligne de commande
+##########################################################################################
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Planificateur de plongée MN90 (moteur léger)")
+    parser.add_argument('--profondeur', type=int, default=20, help="Profondeur max (mètres)")
+    parser.add_argument('--duree', type=int, default=30, help="Durée avant remontée (mn)")
+    parser.add_argument('--gps', help="GPS de la plongée précédente (plongée successive)")
+    parser.add_argument('--intervalle', type=int, default=60, help="Intervalle de surface (mn)")
+    parser.add_argument('--vitesse', type=int, default=10, help="Vitesse de remontée (mètres/mn)")
+    parser.add_argument('--sac', type=int, default=20, help="Consommation du plongeur (litres/mn)")
+    parser.add_argument('--bloc', type=int, default=15, help="Capacité du bloc (litres)")
+    parser.add_argument('--gonflage', type=int, default=200, help="Pression de gonflage (bars)")
+    parser.add_argument('--reserve', type=int, default=50, help="Réserve de sécurité (bars)")
+    parser.add_argument('--data', default=data_dir, help="Répertoire des tables MN90")
+    args = parser.parse_args(argv)
+
+    try:
+        tables = load_tables(args.data)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Erreur lors du chargement : {e}")
+        return 1
+
+    majoration = 0
+    if args.gps:
+        azote = lookup_azote_residuel(args.gps, args.intervalle, tables)
+        if azote.error:
+            print(f"⚠ {azote.message}")
+            return 1
+        majo = lookup_majoration_from_tables(azote.azote, args.profondeur, tables)
+        if majo.error:
+            print(f"⚠ {majo.message}")
+            return 1
+        majoration = majo.majoration
+        print(f"Taux d'azote résiduelle : {azote.azote}")
+        print(f"Majoration appliquée : {majoration} minutes")
+
+    duree_totale = args.duree + majoration
+    stops = lookup_decompression(args.profondeur, duree_totale, tables)
+    if stops.error:
+        print(f"Aucune correspondance trouvée pour {args.profondeur}m / {duree_totale}min")
+        return 1
+
+    air_calc = calculate_air_consumption_excel_method(
+        args.profondeur, duree_totale, args.sac, args.vitesse, stops
+    )
+    if air_calc is None:
+        print("Paramètres invalides")
+        return 1
+    air_remaining = calculate_air_remaining(
+        args.bloc, args.gonflage, args.reserve, air_calc.volume_total, air_calc.volume_plongee
+    )
+    if air_remaining is None:
+        print("Capacité du bloc invalide")
+        return 1
+
+    if air_calc.palier_details:
+        for p in air_calc.palier_details:
+            print(f"Palier à {p.profondeur}m : {p.duree} minutes")
+    else:
+        print("Aucun palier de décompression requis")
+    if stops.gps and stops.gps != 'X':
+        print(f"Groupe de plongées successives : {stops.gps}")
+
+    print(f"Durée totale de remontée (DTR) : {air_calc.dtr} mn")
+    print(f"Durée totale de plongée : {air_calc.temps_total_plongee} mn")
+    print(f"Consommation totale : {air_calc.volume_total} litres")
+    print(f"Pression de décollage : {air_remaining.pression_decollage} bars")
+    print(f"Pression restante : {air_remaining.bars_restants} bars")
+
+    if air_remaining.bars_restants_real >= args.reserve:
+        print(f"Plongée réalisable (marge : +{air_remaining.marge_ou_deficit} bars)")
+    elif air_remaining.bars_restants_real > 0:
+        print(f"Réserve insuffisante ! (déficit : -{abs(air_remaining.marge_ou_deficit)} bars)")
+    else:
+        print(f"Plongée impossible !! (déficit : -{abs(air_remaining.bars_restants_real)} bars)")
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
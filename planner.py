@@ -8,6 +8,7 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import os
+import time
 
 data_1 = 'data/mn90_1.csv' # Table de paliers
 data_2 = 'data/mn90_2.csv' # Table d'azote résiduelle
@@ -107,6 +108,37 @@ def lookup_decompression(depth, duration, mn90_tables):
         st.error(f"Erreur dans la recherche de décompression : {e}")
         return {'15m': 0, '12m': 0, '9m': 0, '6m': 0, '3m': 0, 'gps': '', 'error': True}
 
+@st.cache_data
+def plan_decompression(depth, duration):
+    """Paliers de décompression mis en cache par profondeur et durée"""
+    return lookup_decompression(depth, duration, load_mn90_tables())
+
+@st.cache_resource
+def warm_up():
+    """
+    Charge et valide les tables MN90, puis remplit le cache des combinaisons courantes
+    (profondeurs 10 à 40m, durées 20 à 60mn). Exécuté une seule fois par processus.
+    """
+    start = time.perf_counter()
+    
+    tables = {
+        'mn90_1.csv': (load_mn90_tables(), ['P1', 'P2', 'D1', 'D2', '15m', '12m', '9m', '6m', '3m', 'GPS']),
+        'mn90_2.csv': (load_azote_table(), []),
+        'mn90_3.csv': (load_majoration_table(), ['MAJO'])
+    }
+    for name, (df, colonnes) in tables.items():
+        if df.empty:
+            raise ValueError(f"Table {name} vide ou non chargée")
+        manquantes = [col for col in colonnes if col not in df.columns]
+        if manquantes:
+            raise ValueError(f"Colonnes manquantes dans {name} : {', '.join(manquantes)}")
+    
+    for depth in range(10, 41):
+        for duration in range(20, 61):
+            plan_decompression(depth, duration)
+    
+    return time.perf_counter() - start
+
 def lookup_azote_residuel(gps, intervalle_surface, azote_table):
     """
     Recherche l'azote résiduelle dans la table MN90
@@ -319,6 +351,11 @@ def calculate_air_remaining(tank_capacity, tank_pressure, reserve, volume_total_
 # Interface utilisateur
 ##########################################################################################
 
+try:
+    warm_up()
+except ValueError as e:
+    st.error(f"Erreur de validation des tables : {e}")
+
 st.markdown("<div style='margin-top: 2rem;'></div>", unsafe_allow_html=True)
 st.title("Planificateur de Plongée MN90")
 
@@ -412,7 +449,7 @@ with col2:
     
     if not mn90_tables.empty:
         # Calculer les paliers de décompression
-        decompression_stops = lookup_decompression(profondeur, duree_totale, mn90_tables)
+        decompression_stops = plan_decompression(profondeur, duree_totale)
         
         if not decompression_stops.get('error', False):
             # Calculer la consommation selon la méthode Excel
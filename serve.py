@@ -0,0 +1,110 @@
+##########################################################################################
+# PLANIFICATEUR DE PLONGÉE - LANCEMENT DU SERVEUR AVEC PRÉCHAUFFAGE
+# Auteur: Jérôme Lehuen
+# Version: 0.4 (15/09/2025)
+##########################################################################################
+
+# Exécute une première fois planner.py dans le processus (import de pandas, chargement et
+# validation des tables, remplissage des caches) puis démarre le serveur Streamlit dans
+# ce même processus : les sessions trouvent les caches déjà remplis. Le fichier de
+# disponibilité n'est créé qu'une fois le préchauffage terminé et le serveur à l'écoute.
+# Usage : python serve.py [--port 8501] [--ready-file /tmp/diveplanner.ready]
+
+from urllib.request import urlopen
+import argparse
+import atexit
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+
+from streamlit.testing.v1 import AppTest
+from streamlit.web import bootstrap
+
+script = 'planner.py'
+
+def port_available(port):
+    """Vérifie que le port est libre (sinon le contrôle de santé interrogerait un autre serveur)"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        try:
+            s.bind(('', port))
+        except OSError:
+            return False
+    return True
+
+def warm_up(timeout):
+    """Exécute le script une première fois et retourne la durée du préchauffage"""
+    start = time.perf_counter()
+    app = AppTest.from_file(script, default_timeout=timeout)
+    app.run()
+    if app.exception:
+        raise RuntimeError(app.exception[0].message)
+    if app.error:
+        raise RuntimeError(app.error[0].value)
+    return time.perf_counter() - start
+
+def signal_ready(port, ready_file, warmup_seconds, timeout=60):
+    """Crée le fichier de disponibilité dès que le serveur répond"""
+    url = f'http://localhost:{port}/_stcore/health'
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    break
+        except OSError:
+            pass
+        time.sleep(0.2)
+    else:
+        print(f"Serveur injoignable après {timeout} s : fichier de disponibilité non créé")
+        return
+
+    with open(ready_file, 'w') as f:
+        json.dump({'pid': os.getpid(), 'port': port, 'warmup_seconds': round(warmup_seconds, 3)}, f)
+    print(f"Prêt : {ready_file}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Lance le planificateur après préchauffage")
+    parser.add_argument('--port', type=int, default=8501, help="Port du serveur Streamlit")
+    parser.add_argument(
+        '--ready-file', default=os.path.join(tempfile.gettempdir(), 'diveplanner.ready'),
+        help="Fichier créé lorsque le serveur est prêt"
+    )
+    parser.add_argument('--timeout', type=float, default=120, help="Durée max du préchauffage (s)")
+    parser.add_argument('--disable-cors', action='store_true', help="Désactive la protection CORS (server.enableCORS)")
+    parser.add_argument('--disable-xsrf', action='store_true', help="Désactive la protection XSRF (server.enableXsrfProtection)")
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    if not port_available(args.port):
+        print(f"Port {args.port} déjà utilisé")
+        return 1
+    flag_options = {'server_port': args.port, 'server_headless': True}
+    if args.disable_cors:
+        flag_options['server_enableCORS'] = False
+    if args.disable_xsrf:
+        flag_options['server_enableXsrfProtection'] = False
+    bootstrap.load_config_options(flag_options)
+
+    # Un fichier laissé par un processus précédent ne doit pas signaler ce démarrage
+    if os.path.exists(args.ready_file):
+        os.remove(args.ready_file)
+    atexit.register(lambda: os.path.exists(args.ready_file) and os.remove(args.ready_file))
+
+    try:
+        warmup_seconds = warm_up(args.timeout)
+    except RuntimeError as e:
+        print(f"Échec du préchauffage : {e}")
+        return 1
+    print(f"Préchauffage terminé en {warmup_seconds:.2f} s")
+
+    threading.Thread(
+        target=signal_ready, args=(args.port, args.ready_file, warmup_seconds), daemon=True
+    ).start()
+    bootstrap.run(script, False, [], flag_options)
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())